@@ -1,99 +1,23 @@
 # get_subscribers_for_component.py
-import requests
-import csv
-import json
 import argparse
-import os
+import itertools
 import logging
-from dotenv import load_dotenv
-
-load_dotenv()
+import os
+from contextlib import ExitStack
+
+from subscribers import (
+    STATUSPAGE_PAGE_ID,
+    STATUSPAGE_TOKEN,
+    get_component_id_from_name,
+    get_subscribers_for_component,
+    get_subscribers_for_components,
+    open_csv_writer,
+    open_json_writer,
+)
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
-SUBSCRIBER_FIELDS_TO_PRINT = [
-    "id",
-    "email",
-    "created_at",
-    "mode",
-    "phone_number",
-]
-
-STATUSPAGE_TOKEN = os.getenv("STATUSPAGE_TOKEN")
-STATUSPAGE_PAGE_ID = os.getenv("STATUSPAGE_PAGE_ID")
-BASE_URI = f"https://api.statuspage.io/v1/pages/{STATUSPAGE_PAGE_ID}"
-
-
-def get_component_id_from_name(component_name):
-    logger.info({"function": "get_component_id_from_name", "component_name": component_name})
-    url = f"{BASE_URI}/components"
-    headers = {"Authorization": f"OAuth {STATUSPAGE_TOKEN}"}
-
-    response = requests.get(url, headers=headers)
-    response.raise_for_status()
-
-    for component in response.json():
-        if component["name"].lower() == component_name.lower():
-            return component["id"]
-
-    raise ValueError(f"Component '{component_name}' not found.")
-
-
-def get_all_subscribers():
-    """Paginate through all subscribers (starting at page 0)."""
-    url = f"{BASE_URI}/subscribers"
-    headers = {"Authorization": f"OAuth {STATUSPAGE_TOKEN}"}
-    subscribers = []
-    page = 0
-
-    while True:
-        params = {"page": page}
-        response = requests.get(url, headers=headers, params=params)
-        response.raise_for_status()
-        data = response.json()
-        if not data:
-            break
-        subscribers.extend(data)
-        page += 1
-
-    return subscribers
-
-
-def get_subscribers_for_component(component_id):
-    logger.info({"function": "get_subscribers_for_component", "component_id": component_id})
-    all_subscribers = get_all_subscribers()
-
-    component_subscribers = [
-        {field: sub.get(field) for field in SUBSCRIBER_FIELDS_TO_PRINT}
-        for sub in all_subscribers
-        if component_id in sub.get("components", [])
-    ]
-
-    logger.info(
-        {
-            "function": "get_subscribers_for_component",
-            "component_id": component_id,
-            "component_subscribers_count": len(component_subscribers),
-        }
-    )
-
-    return component_subscribers
-
-
-def save_to_csv(filename, data):
-    with open(filename, mode="w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=SUBSCRIBER_FIELDS_TO_PRINT)
-        writer.writeheader()
-        writer.writerows(data)
-    logger.info({"message": f"Subscribers saved to CSV file: {filename}"})
-
-
-def save_to_json(filename, data):
-    with open(filename, mode="w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4)
-    logger.info({"message": f"Subscribers saved to JSON file: {filename}"})
-
 
 def main(component_name=None, component_id=None, out_csv=None, out_json=None):
     try:
@@ -102,57 +26,123 @@ def main(component_name=None, component_id=None, out_csv=None, out_json=None):
 
         subscribers = get_subscribers_for_component(component_id)
 
-        if not subscribers:
-            logger.info(
-                {
-                    "function": "main",
-                    "message": "No subscribers found.",
-                    "component_id": component_id,
-                }
-            )
+        # Peek so no output files are created when there is nothing to write.
+        first = next(subscribers, None)
+        if first is None:
+            logger.info("function=main component_id=%s message=No subscribers found.", component_id)
             return
 
+        # Stream every subscriber straight into the requested outputs. Subscribers
+        # are only echoed at INFO when no output file was requested; otherwise
+        # they drop to DEBUG and the per-record formatting is skipped entirely.
+        echo_level = logging.DEBUG if out_csv or out_json else logging.INFO
+        echo = logger.isEnabledFor(echo_level)
+        count = 0
+        with ExitStack() as stack:
+            writers = []
+            if out_csv:
+                writers.append(open_csv_writer(stack, out_csv))
+            if out_json:
+                writers.append(open_json_writer(stack, out_json))
+
+            for subscriber in itertools.chain((first,), subscribers):
+                for write in writers:
+                    write(subscriber)
+                if echo:
+                    logger.log(echo_level, subscriber)
+                count += 1
+
         if out_csv:
-            save_to_csv(out_csv, subscribers)
+            logger.info("Subscribers saved to CSV file: %s", out_csv)
 
         if out_json:
-            save_to_json(out_json, subscribers)
-
-        logger.info(
-            {
-                "function": "main",
-                "subscribers_count": len(subscribers),
-                "component_id": component_id,
-            }
-        )
-        for subscriber in subscribers:
-            logger.info(subscriber)
+            logger.info("Subscribers saved to JSON file: %s", out_json)
+
+        logger.info("function=main component_id=%s subscribers_count=%d", component_id, count)
 
     except Exception as e:
         logger.error(
-            {
-                "function": "main",
-                "error": str(e),
-                "component_name": component_name,
-                "component_id": component_id,
-            }
+            "function=main component_name=%s component_id=%s error=%s",
+            component_name,
+            component_id,
+            e,
         )
 
 
+def _component_filename(filename, component_id):
+    """Derive a per-component output path, e.g. ``out.csv`` -> ``out-<component_id>.csv``."""
+    root, ext = os.path.splitext(filename)
+    return f"{root}-{component_id}{ext}"
+
+
+def main_batch(component_ids, out_csv=None, out_json=None):
+    """Write subscribers of several components from a single subscriber scan.
+
+    One CSV/JSON file is written per component that has subscribers, named
+    after ``out_csv``/``out_json`` with the component ID appended.
+    """
+    try:
+        echo_level = logging.DEBUG if out_csv or out_json else logging.INFO
+        echo = logger.isEnabledFor(echo_level)
+        counts = dict.fromkeys(component_ids, 0)
+        with ExitStack() as stack:
+            writers = {}
+            for hits, subscriber in get_subscribers_for_components(component_ids):
+                for component_id in hits:
+                    if component_id not in writers:
+                        # Opened lazily so components without subscribers get no files.
+                        writers[component_id] = []
+                        if out_csv:
+                            writers[component_id].append(
+                                open_csv_writer(stack, _component_filename(out_csv, component_id))
+                            )
+                        if out_json:
+                            writers[component_id].append(
+                                open_json_writer(stack, _component_filename(out_json, component_id))
+                            )
+                    for write in writers[component_id]:
+                        write(subscriber)
+                    counts[component_id] += 1
+                if echo:
+                    logger.log(echo_level, {"component_ids": sorted(hits), **subscriber})
+
+        for component_id, count in counts.items():
+            logger.info("function=main_batch component_id=%s subscribers_count=%d", component_id, count)
+
+    except Exception as e:
+        logger.error("function=main_batch component_ids=%s error=%s", component_ids, e)
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Get Statuspage subscribers for a component.")
-    parser.add_argument("--component-name", type=str, help="Name of the component.")
-    parser.add_argument("--component-id", type=str, help="ID of the component.")
+    component = parser.add_mutually_exclusive_group(required=True)
+    component.add_argument("--component-name", type=str, help="Name of the component.")
+    component.add_argument("--component-id", type=str, help="ID of the component.")
+    component.add_argument(
+        "--component-ids",
+        type=str,
+        help="Comma-separated component IDs; writes one output file per component.",
+    )
     parser.add_argument("--out-csv", type=str, help="Path to output CSV.")
     parser.add_argument("--out-json", type=str, help="Path to output JSON.")
     args = parser.parse_args()
 
-    if not args.component_name and not args.component_id:
-        parser.error("You must provide either --component-name or --component-id.")
-
-    main(
-        component_name=args.component_name,
-        component_id=args.component_id,
-        out_csv=args.out_csv,
-        out_json=args.out_json,
-    )
+    if not STATUSPAGE_TOKEN or not STATUSPAGE_PAGE_ID:
+        parser.error("STATUSPAGE_TOKEN and STATUSPAGE_PAGE_ID must be set in the environment or in .env.")
+
+    if args.component_ids is not None:
+        component_ids = [cid.strip() for cid in args.component_ids.split(",") if cid.strip()]
+        if not component_ids:
+            parser.error("--component-ids must contain at least one component ID.")
+        main_batch(
+            component_ids=component_ids,
+            out_csv=args.out_csv,
+            out_json=args.out_json,
+        )
+    else:
+        main(
+            component_name=args.component_name,
+            component_id=args.component_id,
+            out_csv=args.out_csv,
+            out_json=args.out_json,
+        )
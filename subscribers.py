@@ -0,0 +1,280 @@
+# subscribers.py
+import requests
+import csv
+import itertools
+import os
+import logging
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from functools import lru_cache, partial
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+from urllib3.util.retry import Retry
+
+# Only import python-dotenv when the variables are not already provided by the
+# environment (containers, CI). find_dotenv keeps the usual lookup: this
+# directory first, then each parent directory.
+if not (os.getenv("STATUSPAGE_TOKEN") and os.getenv("STATUSPAGE_PAGE_ID")):
+    from dotenv import find_dotenv, load_dotenv
+
+    load_dotenv(find_dotenv())
+
+logger = logging.getLogger(__name__)
+
+SUBSCRIBER_FIELDS_TO_PRINT = [
+    "id",
+    "email",
+    "created_at",
+    "mode",
+    "phone_number",
+]
+
+STATUSPAGE_TOKEN = os.getenv("STATUSPAGE_TOKEN")
+STATUSPAGE_PAGE_ID = os.getenv("STATUSPAGE_PAGE_ID")
+# Endpoint URLs are built once here, without trailing slashes, so every
+# request hits the canonical path rather than a redirect.
+BASE_URI = f"https://api.statuspage.io/v1/pages/{STATUSPAGE_PAGE_ID}"
+COMPONENTS_URI = f"{BASE_URI}/components"
+SUBSCRIBERS_URI = f"{BASE_URI}/subscribers"
+API_HEADERS = {
+    "Authorization": f"OAuth {STATUSPAGE_TOKEN}",
+    "Content-Type": "application/json",
+    # Advertise every encoding urllib3 can decode (br/zstd as well when
+    # brotli/zstandard are installed), never fewer than its default.
+    "Accept-Encoding": make_headers(accept_encoding=True)["accept-encoding"],
+}
+
+# Maximum number of subscriber pages requested in parallel while paginating.
+MAX_CONCURRENT_PAGES = 16
+# Largest page size the /subscribers endpoint accepts.
+SUBSCRIBERS_PER_PAGE = 100
+
+# Shared session so connections (and their TLS handshakes) are reused across
+# the component lookup and every subscriber page.
+SESSION = requests.Session()
+SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=MAX_CONCURRENT_PAGES,
+        pool_maxsize=MAX_CONCURRENT_PAGES,
+        max_retries=Retry(total=5, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504]),
+    ),
+)
+SESSION.headers.update(API_HEADERS)
+
+
+def _require_credentials():
+    if not STATUSPAGE_TOKEN or not STATUSPAGE_PAGE_ID:
+        raise RuntimeError("STATUSPAGE_TOKEN and STATUSPAGE_PAGE_ID must be set in the environment or in .env.")
+
+
+@lru_cache(maxsize=1)
+def get_components():
+    """Fetch the page's components once and cache them for the process lifetime."""
+    _require_credentials()
+    response = SESSION.get(COMPONENTS_URI)
+    response.raise_for_status()
+    return orjson.loads(response.content)
+
+
+@lru_cache(maxsize=1)
+def get_component_ids_by_name():
+    """Map lowercased component names to component IDs.
+
+    Names need not be unique (e.g. the same name in two groups); the first
+    component with a given name wins, as with a scan of the components list.
+    """
+    ids = {}
+    for component in get_components():
+        ids.setdefault(component["name"].lower(), component["id"])
+    return ids
+
+
+def get_component_id_from_name(component_name):
+    logger.info("function=get_component_id_from_name component_name=%s", component_name)
+
+    try:
+        return get_component_ids_by_name()[component_name.lower()]
+    except KeyError:
+        raise ValueError(f"Component '{component_name}' not found.") from None
+
+
+def get_subscriber_page(page, component_id=None):
+    """Fetch a single page of subscribers, optionally filtered server-side by component."""
+    _require_credentials()
+    params = {"page": page, "per_page": SUBSCRIBERS_PER_PAGE}
+    if component_id:
+        params["component_id"] = component_id
+    response = SESSION.get(SUBSCRIBERS_URI, params=params)
+    response.raise_for_status()
+    # A page holds at most SUBSCRIBERS_PER_PAGE records and is projected down to
+    # SUBSCRIBER_FIELDS_TO_PRINT right away, so an event-driven parse that skips
+    # unused fields would not bound memory any further than decoding it whole.
+    return orjson.loads(response.content)
+
+
+def iter_subscriber_pages(component_id=None):
+    """Yield pages of subscribers in order (starting at page 0).
+
+    The first page is fetched alone. While pages keep coming back as full as
+    the first one, each batch requests as many pages as have been read so far
+    (1, 1, 2, 4, ...), up to MAX_CONCURRENT_PAGES in parallel. A short page
+    drops back to a single request, since the end is probably next. The first
+    empty page marks the end of the subscriber list.
+    """
+    page = 0
+    page_size = None
+    batch = 1
+    fetch_page = partial(get_subscriber_page, component_id=component_id)
+
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_PAGES) as executor:
+        while True:
+            pages = range(page, page + batch)
+            for data in executor.map(fetch_page, pages):
+                if not data:
+                    return
+                if page_size is None:
+                    page_size = len(data)
+                yield data
+            page += batch
+            batch = min(page, MAX_CONCURRENT_PAGES) if len(data) >= page_size else 1
+
+
+def _project(sub):
+    return {field: sub.get(field) for field in SUBSCRIBER_FIELDS_TO_PRINT}
+
+
+def _project_page(data, component_ids):
+    """Project subscribers on any of the frozenset ``component_ids`` to SUBSCRIBER_FIELDS_TO_PRINT."""
+    return [_project(sub) for sub in data if not component_ids.isdisjoint(sub.get("components", ()))]
+
+
+def get_subscribers_for_component(component_id):
+    """Yield subscribers of ``component_id`` page by page as they arrive.
+
+    Each page is projected down to SUBSCRIBER_FIELDS_TO_PRINT immediately, so
+    neither full subscriber records nor the full result set are held in memory.
+    """
+    logger.info("function=get_subscribers_for_component component_id=%s", component_id)
+    # The server already filters by component; the local check guards against
+    # the filter being ignored and is cheap on the reduced result set.
+    targets = frozenset((component_id,))
+    count = 0
+    pages_read = 0
+    try:
+        for data in iter_subscriber_pages(component_id):
+            pages_read += 1
+            matches = _project_page(data, targets)
+            count += len(matches)
+            yield from matches
+    except requests.HTTPError as e:
+        if pages_read or e.response is None or e.response.status_code not in (400, 422):
+            raise
+        logger.warning(
+            "function=get_subscribers_for_component component_id=%s "
+            "message=Server-side component filter rejected; filtering locally.",
+            component_id,
+        )
+        for data in iter_subscriber_pages():
+            matches = _project_page(data, targets)
+            count += len(matches)
+            yield from matches
+
+    logger.info(
+        "function=get_subscribers_for_component component_id=%s component_subscribers_count=%d",
+        component_id,
+        count,
+    )
+
+
+def get_subscribers_for_components(component_ids):
+    """Yield ``(matched_component_ids, subscriber)`` for subscribers of any of ``component_ids``.
+
+    All subscribers are scanned once, however many components are requested.
+    """
+    logger.info("function=get_subscribers_for_components component_ids=%s", component_ids)
+    targets = frozenset(component_ids)
+    for data in iter_subscriber_pages():
+        for sub in data:
+            hits = targets.intersection(sub.get("components", ()))
+            if hits:
+                yield hits, _project(sub)
+
+
+def _open_on_success(stack, filename, mode, footer=None, **kwargs):
+    """Open a temp file next to ``filename`` whose fate is tied to ``stack``.
+
+    If ``stack`` unwinds cleanly, ``footer`` is written and the temp file
+    replaces ``filename``. If it unwinds with an exception, the temp file is
+    deleted, so a failed run never leaves partial output behind.
+    """
+    tmp_filename = f"{filename}.part"
+    f = open(tmp_filename, mode, **kwargs)
+
+    def finish(exc_type, exc, tb):
+        try:
+            if exc_type is None and footer is not None:
+                f.write(footer)
+        finally:
+            f.close()
+        if exc_type is None:
+            os.replace(tmp_filename, filename)
+        else:
+            os.remove(tmp_filename)
+        return False
+
+    stack.push(finish)
+    return f
+
+
+def open_csv_writer(stack, filename):
+    """Open ``filename`` on ``stack``, write the header and return a per-row writer.
+
+    The file only appears at ``filename`` once ``stack`` exits without error.
+    Fields missing from a record are written as empty cells.
+    """
+    f = _open_on_success(stack, filename, "w", newline="", encoding="utf-8")
+    writer = csv.writer(f)
+    writer.writerow(SUBSCRIBER_FIELDS_TO_PRINT)
+
+    # Building the row directly skips DictWriter's per-row key validation and
+    # dict-to-list conversion.
+    def write(subscriber):
+        writer.writerow([subscriber.get(field) for field in SUBSCRIBER_FIELDS_TO_PRINT])
+
+    return write
+
+
+def open_json_writer(stack, filename):
+    """Open ``filename`` on ``stack`` as a JSON array and return a per-item writer.
+
+    Items are written one per line as they arrive. The closing bracket is
+    written, and the file moved into place, only if ``stack`` exits without
+    error.
+    """
+    f = _open_on_success(stack, filename, "wb", footer=b"\n]\n")
+    f.write(b"[")
+    separators = itertools.chain((b"\n",), itertools.repeat(b",\n"))
+
+    def write(item):
+        f.write(next(separators))
+        f.write(orjson.dumps(item))
+
+    return write
+
+
+def save_to_csv(filename, data):
+    with ExitStack() as stack:
+        write = open_csv_writer(stack, filename)
+        for subscriber in data:
+            write(subscriber)
+    logger.info("Subscribers saved to CSV file: %s", filename)
+
+
+def save_to_json(filename, data):
+    with ExitStack() as stack:
+        write = open_json_writer(stack, filename)
+        for subscriber in data:
+            write(subscriber)
+    logger.info("Subscribers saved to JSON file: %s", filename)